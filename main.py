@@ -1,49 +1,224 @@
 import pygame
+import pygame.freetype
 import pymunk
-import pymunk.pygame_util
 import json
-import random
 import math
 import os
+import time
+import types
+import numpy as np
+
+try:
+    import orjson
+    _loads, _dumps = orjson.loads, orjson.dumps
+except ImportError: # Fall back to the stdlib codec, writing the same compact form
+    _loads = json.loads
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
 
 # --- Configuration ---
 WIDTH, HEIGHT = 800, 600
 FPS = 60
+MENU_FPS = 30 # Menus and the editor have no animation that needs more
+INACTIVE_FPS = 10 # While the window is minimized
+MENU_IDLE_MS = 250 # Longest a menu sleeps waiting for input
+PHYSICS_DT = 1 / FPS # Fixed simulation tick, independent of render rate
+MAX_FRAME_TIME = 0.25 # Cap on simulated catch-up after a stall
 BALL_RADIUS = 15
+HAZARD_CELL = BALL_RADIUS * 4 # Hazard grid cell size; a ball spans at most 2x2 cells
 SAVE_FILE = "save_data.json"
+SAVE_BUFFER_SIZE = 65536
+SAVE_INTERVAL = 2.0 # Seconds between debounced save writes
 CUSTOM_LEVEL_FILE = "custom_level.json"
+MAX_PARTICLES = 2048
+PARTICLE_FADE_LEVELS = 8 # Fade is quantized so particles can share cached sprites
+SPRITE_CACHE_MAX = 512 # Particle sprites kept before the cache is dropped and refilled
+EXPLOSION_PARTICLES = 20
+EXPLOSION_COLOR = np.array((255, 100, 0), np.float32)
+TRAIL_JITTER = np.array((3, 3, 1, 1), np.float32) # Max random offset for x, y, vx, vy
+# Trail color by air density in 0.01 steps: red in thin air, blue in thick air
+TRAIL_PALETTE = np.array([(int(255*(1 - i/100)), 100, int(255*i/100)) for i in range(101)], np.float32)
+
+# Pulse animation: |sin| sampled over one turn, indexed by scaled milliseconds
+PULSE_LUT_SIZE = 1024 # Power of two so indices wrap with a mask
+PULSE_LUT = [abs(math.sin(i * 2 * math.pi / PULSE_LUT_SIZE)) for i in range(PULSE_LUT_SIZE)]
+HAZARD_PULSE_SCALE = PULSE_LUT_SIZE / (2 * math.pi * 200) # Same speed as sin(ms / 200)
+GOAL_PULSE_SCALE = PULSE_LUT_SIZE / (2 * math.pi * 300) # Same speed as sin(ms / 300)
+
+# Only these events are ever read; SDL drops everything else before queuing
+ALLOWED_EVENTS = [pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION]
+
+# Held-key controls, polled every frame while playing
+K_UP, K_DOWN, K_LEFT, K_RIGHT = pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT
+K_W, K_S = pygame.K_w, pygame.K_s
+# Keys handled as KEYDOWN events
+K_R, K_ESCAPE = pygame.K_r, pygame.K_ESCAPE
+
+# Gravity controls in priority order: (key, touch button, gravity vector)
+GRAVITY_FORCE = 900
+GRAVITY_CONTROLS = (
+    (K_UP, 'UP', (0, -GRAVITY_FORCE)),
+    (K_DOWN, 'DOWN', (0, GRAVITY_FORCE)),
+    (K_LEFT, 'LEFT', (-GRAVITY_FORCE, 0)),
+    (K_RIGHT, 'RIGHT', (GRAVITY_FORCE, 0)),
+)
+
+# --- Particle Kernel ---
+
+def _step_particles_numpy(x, y, vx, vy, life):
+    x += vx
+    y += vy
+    vy += 0.3
+    vx *= 0.98
+    life -= 1
+
+def _step_particles_loop(x, y, vx, vy, life):
+    """Advance every particle one frame in a single fused loop"""
+    for i in range(x.shape[0]):
+        x[i] += vx[i]
+        y[i] += vy[i]
+        vy[i] += 0.3
+        vx[i] *= 0.98
+        life[i] -= 1
+
+def particle_kernel():
+    """Returns the particle step function, importing numba only when called"""
+    try:
+        from numba import njit
+    except ImportError: # Fall back to plain NumPy
+        return _step_particles_numpy
+    # Serial on purpose: at MAX_PARTICLES the thread pool costs more than it saves
+    return njit(cache=True, fastmath=True)(_step_particles_loop)
 
 # --- Helper Classes ---
 
-class Particle:
-    """Simple particle for trail and explosion effects"""
-    def __init__(self, x, y, vx, vy, color, lifetime=30):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.color = color
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-        self.size = random.randint(2, 5)
-    
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += 0.3
-        self.vx *= 0.98
-        self.lifetime -= 1
-    
+class ParticleSystem:
+    """Fixed-capacity particle pool stored as flat arrays; the first n slots are live"""
+    FIELDS = ('x', 'y', 'vx', 'vy', 'life', 'max_life', 'size', 'color')
+
+    def __init__(self, capacity=MAX_PARTICLES, rng=None):
+        self.capacity = capacity
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.x = np.empty(capacity, np.float32)
+        self.y = np.empty(capacity, np.float32)
+        self.vx = np.empty(capacity, np.float32)
+        self.vy = np.empty(capacity, np.float32)
+        self.life = np.empty(capacity, np.float32)
+        self.max_life = np.empty(capacity, np.float32)
+        self.size = np.empty(capacity, np.int32)
+        self.color = np.empty((capacity, 3), np.float32)
+        self.n = 0
+        self._sprites = {} # (r, g, b, size) -> pre-drawn circle Surface
+        self._step = None # Resolved by warm(), so menu-only sessions never import numba
+
+    def warm(self):
+        """Resolves and compiles (or loads from cache) the step kernel so the first explosion doesn't hitch"""
+        if self._step is not None: return
+        self._step = particle_kernel()
+        scratch = np.zeros(1, np.float32) # Live slots may already be in use
+        self._step(scratch, scratch.copy(), scratch.copy(), scratch.copy(), scratch.copy())
+
+    def clear(self):
+        self.n = 0
+
+    def alloc(self, count):
+        """Reserves up to count slots at the end of the pool and returns them as a slice"""
+        start = self.n
+        self.n = min(start + count, self.capacity)
+        return slice(start, self.n)
+
+    def emit(self, x, y, vx, vy, color, lifetime):
+        """Adds particles; x/y/vx/vy may be scalars or equal-length arrays (one per particle)"""
+        count = np.broadcast(x, y, vx, vy).size
+        s = self.alloc(count)
+        k = s.stop - s.start
+        if not k: return
+        if k < count: # Pool is full, keep what fits
+            x, y, vx, vy = (np.broadcast_to(a, count)[:k] for a in (x, y, vx, vy))
+        self.x[s] = x
+        self.y[s] = y
+        self.vx[s] = vx
+        self.vy[s] = vy
+        self.color[s] = color
+        self.life[s] = self.max_life[s] = lifetime
+        self.size[s] = self.rng.integers(2, 6, k)
+
+    def step(self):
+        n = self.n
+        if not n: return
+        if self._step is None: self.warm()
+        self._step(self.x[:n], self.y[:n], self.vx[:n], self.vy[:n], self.life[:n])
+
+        # Swap-and-pop: refill holes left by dead particles with survivors
+        # from the tail, so culling only touches the slots that changed
+        dead = np.flatnonzero(self.life[:n] <= 0)
+        if dead.size:
+            k = n - dead.size
+            holes = dead[dead < k]
+            movers = k + np.flatnonzero(self.life[k:n] > 0)
+            if holes.size:
+                for name in self.FIELDS:
+                    arr = getattr(self, name)
+                    arr[holes] = arr[movers]
+            self.n = k
+
+    def sprite(self, key):
+        """Circle of the given color and radius on a transparent square, drawn once and cached"""
+        surf = self._sprites.get(key)
+        if surf is None:
+            if len(self._sprites) >= SPRITE_CACHE_MAX: self._sprites.clear()
+            r, g, b, size = key
+            surf = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (r, g, b), (size, size), size)
+            surf = self._sprites[key] = surf.convert_alpha()
+        return surf
+
     def draw(self, screen):
-        if self.lifetime > 0:
-            faded_color = tuple(int(c * (self.lifetime / self.max_lifetime)) for c in self.color[:3])
-            pygame.draw.circle(screen, faded_color, (int(self.x), int(self.y)), self.size)
-    
-    def is_alive(self):
-        return self.lifetime > 0
+        n = self.n
+        if not n: return
+        fade = np.ceil(self.life[:n] / self.max_life[:n] * PARTICLE_FADE_LEVELS) / PARTICLE_FADE_LEVELS
+        faded = (self.color[:n] * fade[:, None]).astype(np.uint32)
+        sizes = self.size[:n]
+        # Pack (r, g, b, size) into one int so sprites are looked up once per distinct key
+        keys = faded[:, 0] << 24 | faded[:, 1] << 16 | faded[:, 2] << 8 | sizes.astype(np.uint32)
+        uniq, inverse = np.unique(keys, return_inverse=True)
+        table = [self.sprite((k >> 24, (k >> 16) & 255, (k >> 8) & 255, k & 255)) for k in uniq.tolist()]
+        xs = (self.x[:n].astype(np.int32) - sizes).tolist()
+        ys = (self.y[:n].astype(np.int32) - sizes).tolist()
+        screen.blits([(table[i], (x, y)) for i, x, y in zip(inverse.tolist(), xs, ys)], doreturn=False)
+
+# --- Geometry ---
+def ball_overlaps(x, y, boxes):
+    """Mask of BALL_RADIUS*2 squares centered at integer x, y overlapping (H, 4) boxes, same edges as Rect.colliderect"""
+    r = BALL_RADIUS
+    return (x - r < boxes[:, 2]) & (x + r > boxes[:, 0]) & (y - r < boxes[:, 3]) & (y + r > boxes[:, 1])
+
+def color_rects(surf, area, color):
+    """Rects covering exactly the pixels of surf inside area that are color: row runs, stacked where they repeat"""
+    area = area.clip(surf.get_rect())
+    if not area.width or not area.height: return []
+    pixels = pygame.surfarray.array2d(surf.subsurface(area))
+    padded = np.zeros((area.height, area.width + 2), np.int8)
+    padded[:, 1:-1] = (pixels == surf.map_rgb(color)).T
+    ys, xs = np.nonzero(np.diff(padded, axis=1))
+    if not len(ys): return []
+    y, x0, x1 = ys[::2], xs[::2], xs[1::2]
+    # Identical runs on consecutive rows become one rect
+    order = np.lexsort((y, x1, x0))
+    y, x0, x1 = y[order], x0[order], x1[order]
+    new = np.ones(len(y), bool)
+    new[1:] = (x0[1:] != x0[:-1]) | (x1[1:] != x1[:-1]) | (y[1:] != y[:-1] + 1)
+    first = np.flatnonzero(new)
+    last = np.append(first[1:], len(y)) - 1
+    x0, x1, y = x0 + area.x, x1 + area.x, y + area.y
+    return [pygame.Rect(a, top, b - a, bottom - top + 1) for a, b, top, bottom
+            in zip(x0[first].tolist(), x1[first].tolist(), y[first].tolist(), y[last].tolist())]
 
 class Button:
     """Simple button class for menu"""
+    __slots__ = ('rect', 'text', 'color', 'hover_color', 'text_col', 'is_hovered', 'is_pressed',
+                 '_surfs', '_surf_font')
+
     def __init__(self, x, y, width, height, text, color, hover_color, text_col=(255,255,255)):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
@@ -52,16 +227,27 @@ class Button:
         self.text_col = text_col
         self.is_hovered = False
         self.is_pressed = False # For continuous press detection (touch controls)
+        self._surfs = None # (normal, highlighted) renders made with _surf_font
+        self._surf_font = None
+
+    def bake(self, font):
+        """Renders the normal and highlighted looks, background, border and label, once per font"""
+        size = self.rect.size
+        label = font.render(self.text, True, self.text_col) if self.text else None
+        surfs = []
+        for color in (self.color, self.hover_color):
+            surf = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.draw.rect(surf, color, surf.get_rect(), border_radius=10)
+            pygame.draw.rect(surf, (255, 255, 255), surf.get_rect(), 3, border_radius=10)
+            if label: surf.blit(label, label.get_rect(center=(size[0]//2, size[1]//2)))
+            surfs.append(surf.convert_alpha())
+        self._surfs = surfs
+        self._surf_font = font
     
-    def draw(self, screen, font):
-        color = self.hover_color if (self.is_hovered or self.is_pressed) else self.color
-        pygame.draw.rect(screen, color, self.rect, border_radius=10)
-        pygame.draw.rect(screen, (255, 255, 255), self.rect, 3, border_radius=10)
-        
-        if self.text:
-            text_surf = font.render(self.text, True, self.text_col)
-            text_rect = text_surf.get_rect(center=self.rect.center)
-            screen.blit(text_surf, text_rect)
+    def draw(self, screen, font, highlighted=None):
+        if highlighted is None: highlighted = self.is_hovered or self.is_pressed
+        if self._surf_font is not font: self.bake(font)
+        screen.blit(self._surfs[1 if highlighted else 0], self.rect)
     
     def handle_event(self, event):
         if event.type == pygame.MOUSEMOTION:
@@ -96,18 +282,36 @@ class TouchInterface:
 
         self.buttons = [self.btn_up, self.btn_down, self.btn_left, self.btn_right, 
                         self.btn_w, self.btn_s, self.pause_btn]
+        # Buttons don't overlap, so one collidelist call finds the only one under the pointer
+        self._rects = [btn.rect for btn in self.buttons]
+        self._probe = pygame.Rect(0, 0, 1, 1)
+        self._hovered = -1
 
     def draw(self, screen, font):
         for btn in self.buttons:
             btn.draw(screen, font)
 
+    def hit_test(self, pos):
+        """Index of the button under pos, or -1"""
+        self._probe.topleft = pos
+        return self._probe.collidelist(self._rects)
+
     def handle_event(self, event):
-        action = None
-        for btn in self.buttons:
-            if btn.handle_event(event):
-                if btn == self.pause_btn:
-                    action = "PAUSE"
-        return action
+        if event.type == pygame.MOUSEMOTION:
+            hit = self.hit_test(event.pos)
+            if hit != self._hovered:
+                if self._hovered != -1: self.buttons[self._hovered].is_hovered = False
+                if hit != -1: self.buttons[hit].is_hovered = True
+                self._hovered = hit
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            hit = self.hit_test(event.pos)
+            if hit != -1:
+                btn = self.buttons[hit]
+                btn.is_pressed = True
+                if btn is self.pause_btn: return "PAUSE"
+        elif event.type == pygame.MOUSEBUTTONUP:
+            for btn in self.buttons: btn.is_pressed = False
+        return None
 
     def get_input_state(self):
         """Returns dict of pressed states mimicking keyboard"""
@@ -127,10 +331,30 @@ class PhysicsGame:
         pygame.init()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Gravity Puzzle - Enhanced")
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(ALLOWED_EVENTS)
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont("Arial", 18)
         self.big_font = pygame.font.SysFont("Arial", 36, bold=True)
         self.title_font = pygame.font.SysFont("Arial", 48, bold=True)
+        # The HUD line is redrawn in place with freetype, positioned by baseline so it doesn't jitter
+        self.hud_font = pygame.freetype.SysFont("Arial", 18)
+        self.hud_font.origin = True
+        self._hud_surf = pygame.Surface((WIDTH - 20, self.hud_font.get_sized_height()), pygame.SRCALPHA).convert_alpha()
+        self._pause_overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA).convert_alpha()
+        self._pause_overlay.fill((0, 0, 0, 128))
+        self._paused_surf = self.big_font.render("PAUSED", True, (255,255,255)).convert_alpha()
+        self._death_key = None
+        # Every ball looks the same: one pre-drawn sprite, blitted at each ball's top-left
+        self._ball_sprite = pygame.Surface((BALL_RADIUS*2, BALL_RADIUS*2), pygame.SRCALPHA)
+        pygame.draw.circle(self._ball_sprite, (255, 50, 50), (BALL_RADIUS, BALL_RADIUS), BALL_RADIUS)
+        pygame.draw.circle(self._ball_sprite, (255, 255, 255), (BALL_RADIUS, BALL_RADIUS), BALL_RADIUS, 2)
+        self._ball_sprite = self._ball_sprite.convert_alpha()
+        # Editor backdrop: fill plus grid lines, identical every frame
+        self._editor_grid_bg = pygame.Surface((WIDTH, HEIGHT)).convert()
+        self._editor_grid_bg.fill((30, 30, 40))
+        for x in range(0, WIDTH, 50): pygame.draw.line(self._editor_grid_bg, (40,40,50), (x,0), (x,HEIGHT))
+        for y in range(0, HEIGHT, 50): pygame.draw.line(self._editor_grid_bg, (40,40,50), (0,y), (WIDTH,y))
         
         # Load Levels
         self.load_levels_from_disk()
@@ -141,7 +365,9 @@ class PhysicsGame:
         # Game state
         self.state = "MAIN_MENU" 
         self.current_level_index = 0
-        self.particles = []
+        self._rng = np.random.default_rng() # Shared by all effect randomness
+        self.particles = ParticleSystem(rng=self._rng)
+        self.space = pymunk.Space() # Emptied and refilled by load_level
         self.trail_counter = 0
         self.death_animation = False
         self.death_timer = 0
@@ -149,12 +375,23 @@ class PhysicsGame:
         self.level_time = 0
         self.paused = False
         
-        # Multi-ball support
-        self.balls = [] # List of dicts: {'body': b, 'shape': s}
+        # Multi-ball support: parallel lists of bodies/shapes plus (N, 2) center arrays
+        self._ball_bodies, self._ball_shapes = [], []
+        self._ball_pos = np.empty((0, 2)) # Synced from the bodies once per tick
+        self._ball_prev = self._ball_pos # Centers before the last tick, for interpolation
+        self.render_alpha = 1.0 # How far rendering is between the previous and current tick
         
         # Systems
         self.touch_ui = TouchInterface()
         self.create_menu_buttons()
+        self._menu_bg_cache = {} # name -> (key, Surface) for static menu screens
+        # Event-driven states: state -> (input handler taking the event list, draw)
+        self._menu_states = {
+            "MAIN_MENU": (self.handle_menu_input, self.draw_main_menu),
+            "LEVEL_SELECT": (self.handle_level_select_input, self.draw_level_select),
+            "EDITOR": (self.handle_editor_input, self.draw_editor),
+            "STATS": (self.handle_stats_input, self.draw_stats),
+        }
         
         # Editor State Variables
         self.editor_reset()
@@ -163,10 +400,11 @@ class PhysicsGame:
 
     def load_levels_from_disk(self):
         try:
-            with open('levels.json', 'r') as f:
-                self.levels_data = json.load(f)
+            with open('levels.json', 'rb') as f:
+                # Parsed once; levels are read-only for the rest of the run
+                self.levels_data = tuple(types.MappingProxyType(lvl) for lvl in _loads(f.read()))
         except FileNotFoundError:
-            self.levels_data = [] # Should handle gracefully
+            self.levels_data = () # Should handle gracefully
             print("levels.json not found.")
 
     def create_menu_buttons(self):
@@ -203,16 +441,28 @@ class PhysicsGame:
         ]
 
     def load_save_data(self):
+        self._last_save_t = 0.0
         if os.path.exists(SAVE_FILE):
-            with open(SAVE_FILE, 'r') as f:
-                self.save_data = json.load(f)
+            with open(SAVE_FILE, 'rb', buffering=SAVE_BUFFER_SIZE) as f:
+                self.save_data = _loads(f.read())
+            self._save_dirty = False
         else:
             self.save_data = {"unlocked_levels": 1, "level_scores": {}, "total_time": 0, "total_deaths": 0}
-            self.save_game()
+            self._save_dirty = True
+            self.save_game(force=True)
     
-    def save_game(self):
-        with open(SAVE_FILE, 'w') as f:
-            json.dump(self.save_data, f, indent=2)
+    def save_game(self, force=False):
+        """Writes save data if it changed, at most every SAVE_INTERVAL seconds unless forced"""
+        if not self._save_dirty: return
+        now = time.monotonic()
+        if not force and now - self._last_save_t < SAVE_INTERVAL: return
+        # Write a temp file and swap it in so a crash never leaves a torn save
+        tmp = SAVE_FILE + ".tmp"
+        with open(tmp, 'wb', buffering=SAVE_BUFFER_SIZE) as f:
+            f.write(_dumps(self.save_data))
+        os.replace(tmp, SAVE_FILE)
+        self._save_dirty = False
+        self._last_save_t = now
 
     def load_level(self, index, custom_data=None):
         """Loads a level. If custom_data is provided, uses that instead of index."""
@@ -231,31 +481,63 @@ class PhysicsGame:
             return
 
         # Reset State
-        self.particles = []
+        self.particles.clear()
+        self.particles.warm() # A level is about to play, so pay the kernel setup here
         self.death_animation = False
         self.death_timer = 0
         self.lives = data.get('lives', 3)
         self.level_time = 0
-        self.balls = [] # Clear old balls
+        self._ball_bodies, self._ball_shapes = [], [] # Clear old balls
 
-        # Physics Setup
-        self.space = pymunk.Space()
-        self.draw_options = pymunk.pygame_util.DrawOptions(self.screen)
+        # Physics Setup: reuse the space, only its contents change between loads
+        space = self.space
+        if space.shapes or space.bodies: space.remove(*space.shapes, *space.bodies)
         self.space.gravity = tuple(data['gravity_start'])
         self.space.damping = data['damping_start']
         
         # Objects
         self.goal_rect = pygame.Rect(data['goal_rect'])
-        self.create_boundary()
-        
-        for w in data['walls']:
-            self.create_block(w[0], w[1], w[2], w[3])
-
         self.hazard_rects = []
         if 'hazards' in data:
             for h in data['hazards']:
                 self.hazard_rects.append(pygame.Rect(h[0], h[1], h[2], h[3]))
 
+        # Hazard bounds as one (H, 4) array of left, top, right, bottom
+        self._hz = np.array([(h.left, h.top, h.right, h.bottom) for h in self.hazard_rects], np.int32).reshape(-1, 4)
+
+        # Bucket hazard indices by grid cell so a ball only tests the ones near it
+        self.hazard_grid = {}
+        for i, h in enumerate(self.hazard_rects):
+            for cx in range(h.left // HAZARD_CELL, (h.right - 1) // HAZARD_CELL + 1):
+                for cy in range(h.top // HAZARD_CELL, (h.bottom - 1) // HAZARD_CELL + 1):
+                    self.hazard_grid.setdefault((cx, cy), []).append(i)
+
+        # Level geometry never moves, so hazards, goal and walls are drawn once
+        # onto the level background at their base colors
+        self._level_bg = pygame.Surface((WIDTH, HEIGHT)).convert()
+        self._level_bg.fill((20, 20, 30))
+        for h in self.hazard_rects:
+            pygame.draw.rect(self._level_bg, (150, 0, 0), h)
+            # Simple spikes
+            points = [(h.left, h.top)]
+            for i in range(0, h.width, 10):
+                points.append((h.left+i+5, h.top-5))
+                points.append((h.left+i+10, h.top))
+            pygame.draw.lines(self._level_bg, (100, 0, 0), False, points)
+        pygame.draw.rect(self._level_bg, (0, 150, 0), self.goal_rect)
+
+        self._wall_shapes = []
+        self.create_boundary()
+        for w in data['walls']:
+            self.create_block(w[0], w[1], w[2], w[3])
+        self.space.add(*self._wall_shapes)
+
+        # Only pixels still showing a base color pulse, so walls, the goal and
+        # spike lines drawn over a hazard stay as they are
+        hz_area = self.hazard_rects[0].unionall(self.hazard_rects) if self.hazard_rects else pygame.Rect(0, 0, 0, 0)
+        self._hazard_glow = color_rects(self._level_bg, hz_area, (150, 0, 0))
+        self._goal_glow = color_rects(self._level_bg, self.goal_rect, (0, 150, 0))
+
         # Multi-Ball Spawning Logic
         start_pos = data['start_pos']
         # Check if it's a list of lists (Multiple balls) or just [x, y]
@@ -264,6 +546,16 @@ class PhysicsGame:
                 self.create_ball(pos[0], pos[1])
         else:
             self.create_ball(start_pos[0], start_pos[1])
+        self.sync_ball_positions()
+        self._ball_prev = self._ball_pos
+
+        # HUD label is fixed for the whole level
+        if self.current_level_index != -1:
+            label = f"Level {data['level_id']}: {data['name']}"
+        else:
+            label = "Level ?: Custom Level"
+        self._level_label = label
+        self._hud_key = None
         
         self.state = "PLAYING"
 
@@ -273,13 +565,11 @@ class PhysicsGame:
             self.create_block(x, y, w, h)
 
     def create_block(self, x, y, w, h):
-        center_x, center_y = x + w / 2, y + h / 2
-        body = pymunk.Body(body_type=pymunk.Body.STATIC)
-        body.position = (center_x, center_y)
-        shape = pymunk.Poly.create_box(body, (w, h))
+        """Queues a wall on the space's shared static body; load_level adds them all at once"""
+        shape = pymunk.Poly.create_box_bb(self.space.static_body, pymunk.BB(x, y, x + w, y + h))
         shape.elasticity, shape.friction = 0.8, 0.5
-        shape.color = (150, 150, 150, 255)
-        self.space.add(body, shape)
+        self._wall_shapes.append(shape)
+        pygame.draw.rect(self._level_bg, (150, 150, 150), (x, y, w, h))
 
     def create_ball(self, x, y):
         mass, radius = 10, BALL_RADIUS
@@ -288,72 +578,94 @@ class PhysicsGame:
         body.position = x, y
         shape = pymunk.Circle(body, radius)
         shape.elasticity, shape.friction = 0.8, 0.5
-        shape.color = (255, 50, 50, 255)
         self.space.add(body, shape)
-        self.balls.append({'body': body, 'shape': shape})
+        self._ball_bodies.append(body)
+        self._ball_shapes.append(shape)
 
     # --- Particle Effects ---
-    def create_trail_particle(self, body):
-        bx, by = body.position
-        vx, vy = body.velocity
-        damping = self.space.damping
-        color = (int(255*(1-damping)), 100, int(255*damping))
-        p = Particle(bx + random.uniform(-3,3), by + random.uniform(-3,3), 
-                     vx*0.3 + random.uniform(-1,1), vy*0.3 + random.uniform(-1,1), color, 20)
-        self.particles.append(p)
+    def create_trail_particles(self):
+        """Emits one trail particle behind every ball"""
+        bodies = self._ball_bodies
+        if not bodies: return
+        pos = self._ball_pos
+        vel = np.array([b.velocity for b in bodies], np.float32)
+        jitter = self._rng.uniform(-1, 1, (len(bodies), 4)).astype(np.float32) * TRAIL_JITTER
+        self.particles.emit(pos[:, 0] + jitter[:, 0], pos[:, 1] + jitter[:, 1],
+                            vel[:, 0]*0.3 + jitter[:, 2], vel[:, 1]*0.3 + jitter[:, 3],
+                            TRAIL_PALETTE[round(self.space.damping * 100)], 20)
 
     def create_explosion(self, x, y):
-        for _ in range(20):
-            angle = random.uniform(0, 6.28)
-            speed = random.uniform(2, 8)
-            p = Particle(x, y, math.cos(angle)*speed, math.sin(angle)*speed, (255, 100, 0), 40)
-            self.particles.append(p)
+        angle = self._rng.uniform(0, 6.28, EXPLOSION_PARTICLES)
+        speed = self._rng.uniform(2, 8, EXPLOSION_PARTICLES)
+        self.particles.emit(x, y, np.cos(angle)*speed, np.sin(angle)*speed, EXPLOSION_COLOR, 40)
 
     # --- Game Logic ---
+    def sync_ball_positions(self):
+        """Reads every ball body's position into _ball_pos in one pass"""
+        self._ball_pos = np.array([b.position for b in self._ball_bodies], np.float64).reshape(-1, 2)
+
+    def hazards_near(self, x, y):
+        """Indices of hazards sharing a grid cell with the ball box centered at x, y (may contain duplicates)"""
+        grid = self.hazard_grid
+        if not grid: return []
+        r = BALL_RADIUS
+        nearby = []
+        for cx in range((x - r) // HAZARD_CELL, (x + r - 1) // HAZARD_CELL + 1):
+            for cy in range((y - r) // HAZARD_CELL, (y + r - 1) // HAZARD_CELL + 1):
+                cell = grid.get((cx, cy))
+                if cell: nearby += cell
+        return nearby
+
     def check_hazards(self):
-        if self.death_animation: return
+        if self.death_animation or not self._ball_bodies or not len(self._hz): return
         
-        hit = False
-        for ball in self.balls[:]:
-            bx, by = ball['body'].position
-            ball_rect = pygame.Rect(bx - BALL_RADIUS, by - BALL_RADIUS, BALL_RADIUS*2, BALL_RADIUS*2)
-            
-            for hazard in self.hazard_rects:
-                if ball_rect.colliderect(hazard):
-                    hit = True
-                    self.create_explosion(bx, by)
-                    self.space.remove(ball['body'], ball['shape'])
-                    self.balls.remove(ball)
-                    break 
-        
-        if hit:
-            self.lives -= 1
-            self.save_data["total_deaths"] += 1
-            # If any ball dies, reset logic
-            self.death_animation = True
-            self.death_timer = 90 if self.lives <= 0 else 30
+        # Boxes are centered at the truncated ball position, as Rect.center would
+        pos = self._ball_pos
+        c = pos.astype(np.int32)
+        hit = np.zeros(len(c), bool)
+        for b, (x, y) in enumerate(c.tolist()):
+            nearby = self.hazards_near(x, y)
+            if nearby: hit[b] = ball_overlaps(x, y, self._hz[nearby]).any()
+        if not hit.any(): return
+
+        dead = []
+        for i in np.flatnonzero(hit):
+            self.create_explosion(pos[i, 0], pos[i, 1])
+            dead += (self._ball_bodies[i], self._ball_shapes[i])
+        self.space.remove(*dead)
+        keep = ~hit
+        self._ball_bodies = [b for b, k in zip(self._ball_bodies, keep) if k]
+        self._ball_shapes = [s for s, k in zip(self._ball_shapes, keep) if k]
+        self._ball_pos, self._ball_prev = pos[keep], self._ball_prev[keep]
+
+        self.lives -= 1
+        self.save_data["total_deaths"] += 1
+        self._save_dirty = True # Written at level end or on quit
+        # If any ball dies, reset logic
+        self.death_animation = True
+        self.death_timer = 90 if self.lives <= 0 else 30
 
     def check_win(self):
-        if self.death_animation or not self.balls: return
-
-        all_in_goal = True
-        for ball in self.balls:
-            bx, by = ball['body'].position
-            if not self.goal_rect.collidepoint(bx, by):
-                all_in_goal = False
-                break
-        
-        if all_in_goal:
+        if self.death_animation or not self._ball_bodies: return
+
+        pos, g = self._ball_pos, self.goal_rect
+        bx, by = pos[:, 0], pos[:, 1]
+        if ((bx >= g.left) & (bx < g.right) & (by >= g.top) & (by < g.bottom)).all():
             # Win!
             score = max(0, 10000 - self.level_time * 10)
             if self.current_level_index != -1: # Don't save stats for custom levels
                 lvl_id = str(self.levels_data[self.current_level_index]['level_id'])
+                progress = False
                 if lvl_id not in self.save_data["level_scores"] or score > self.save_data["level_scores"][lvl_id]:
                     self.save_data["level_scores"][lvl_id] = score
+                    progress = True
                 if self.current_level_index + 1 > self.save_data["unlocked_levels"]:
                     self.save_data["unlocked_levels"] = self.current_level_index + 1
+                    progress = True
                 self.save_data["total_time"] += self.level_time / FPS
-                self.save_game()
+                self._save_dirty = True
+                # New scores and unlocks hit disk right away; only play time may wait
+                self.save_game(force=progress)
                 self.current_level_index += 1
                 print('WIN')
                 self.load_level(self.current_level_index)
@@ -363,20 +675,21 @@ class PhysicsGame:
 
     # --- Input Handling ---
     def handle_playing_input(self):
-        keys = pygame.key.get_pressed()
-        touch_state = self.touch_ui.get_input_state()
-        
         if not self.paused and not self.death_animation:
-            force = 900
-            if keys[pygame.K_UP] or touch_state['UP']:    self.space.gravity = (0, -force)
-            elif keys[pygame.K_DOWN] or touch_state['DOWN']:  self.space.gravity = (0, force)
-            elif keys[pygame.K_LEFT] or touch_state['LEFT']:  self.space.gravity = (-force, 0)
-            elif keys[pygame.K_RIGHT] or touch_state['RIGHT']: self.space.gravity = (force, 0)
+            keys = pygame.key.get_pressed()
+            touch_state = self.touch_ui.get_input_state()
+            # Only touch the space when a held control actually changes something
+            for key, touch, gravity in GRAVITY_CONTROLS:
+                if keys[key] or touch_state[touch]:
+                    if self.space.gravity != gravity: self.space.gravity = gravity
+                    break
             
-            if keys[pygame.K_w] or touch_state['W']: self.space.damping = min(1.0, self.space.damping + 0.01)
-            if keys[pygame.K_s] or touch_state['S']: self.space.damping = max(0.1, self.space.damping - 0.01)
+            step = 0.01 * ((keys[K_W] or touch_state['W']) - (keys[K_S] or touch_state['S']))
+            if step:
+                damping = max(0.1, min(1.0, self.space.damping + step))
+                if damping != self.space.damping: self.space.damping = damping
 
-        for event in pygame.event.get():
+        for event in pygame.event.get(ALLOWED_EVENTS):
             if event.type == pygame.QUIT: self.running = False
             
             # Handle Touch UI events
@@ -384,10 +697,10 @@ class PhysicsGame:
             if ui_action == "PAUSE": self.paused = not self.paused
 
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_r: 
+                if event.key == K_R: 
                     if self.current_level_index == -1: self.load_level(-1, self.loaded_custom_data)
                     else: self.load_level(self.current_level_index)
-                elif event.key == pygame.K_ESCAPE: self.paused = not self.paused
+                elif event.key == K_ESCAPE: self.paused = not self.paused
             
             if self.paused:
                 for button in self.pause_menu_buttons:
@@ -411,13 +724,13 @@ class PhysicsGame:
         self.drag_start = None
         self.loaded_custom_data = None # Stores data for "Play Custom"
 
-    def handle_editor_input(self):
+    def handle_editor_input(self, events):
         mouse_pos = pygame.mouse.get_pos()
         # Snap to grid
         grid_size = 10
         snapped_pos = (round(mouse_pos[0]/grid_size)*grid_size, round(mouse_pos[1]/grid_size)*grid_size)
         
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT: self.running = False
             
             # Handle Toolbar
@@ -477,11 +790,7 @@ class PhysicsGame:
             self.load_level(-1, self.loaded_custom_data)
 
     def draw_editor(self):
-        self.screen.fill((30, 30, 40))
-        
-        # Grid
-        for x in range(0, WIDTH, 50): pygame.draw.line(self.screen, (40,40,50), (x,0), (x,HEIGHT))
-        for y in range(0, HEIGHT, 50): pygame.draw.line(self.screen, (40,40,50), (0,y), (WIDTH,y))
+        self.screen.blit(self._editor_grid_bg, (0, 0))
 
         # Objects
         for w in self.editor_walls: pygame.draw.rect(self.screen, (150, 150, 150), w)
@@ -512,7 +821,8 @@ class PhysicsGame:
 
     # --- Main Loop Integration ---
 
-    def update(self):
+    def update_physics(self, dt):
+        """Advances the level by one fixed tick"""
         if self.state == "PLAYING":
             if self.paused: return
             
@@ -520,7 +830,7 @@ class PhysicsGame:
                 self.death_timer -= 1
                 if self.death_timer <= 0:
                     if self.lives <= 0:
-                        self.state = "MAIN_MENU"
+                        self.state = "MAIN_MENU" # Save is flushed by run() on the way out
                     else:
                         # Respawn
                         if self.current_level_index == -1:
@@ -528,76 +838,75 @@ class PhysicsGame:
                         else:
                             self.load_level(self.current_level_index)
             else:
-                self.space.step(1/60.0)
+                self._ball_prev = self._ball_pos
+                self.space.step(dt)
+                self.sync_ball_positions()
                 self.level_time += 1
                 self.check_hazards()
                 self.check_win()
                 
                 self.trail_counter += 1
                 if self.trail_counter >= 3:
-                    for ball in self.balls:
-                        self.create_trail_particle(ball['body'])
+                    self.create_trail_particles()
                     self.trail_counter = 0
             
-            for particle in self.particles[:]:
-                particle.update()
-                if not particle.is_alive():
-                    self.particles.remove(particle)
+            self.particles.step()
 
     def draw_playing(self):
-        self.screen.fill((20, 20, 30))
+        self.screen.blit(self._level_bg, (0, 0))
         
         # Visuals
-        pulse = abs(math.sin(pygame.time.get_ticks() / 200))
-        hazard_color = (int(150 + 105 * pulse), 0, 0)
-        for h in self.hazard_rects:
-            pygame.draw.rect(self.screen, hazard_color, h)
-            # Simple spikes
-            for i in range(0, h.width, 10):
-                pygame.draw.line(self.screen, (100,0,0), (h.left+i, h.top), (h.left+i+5, h.top-5))
-                pygame.draw.line(self.screen, (100,0,0), (h.left+i+5, h.top-5), (h.left+i+10, h.top))
+        ticks = pygame.time.get_ticks()
+        pulse = PULSE_LUT[int(ticks * HAZARD_PULSE_SCALE) & (PULSE_LUT_SIZE - 1)]
+        pulse_add = (int(105 * pulse), 0, 0)
+        for h in self._hazard_glow: self.screen.fill(pulse_add, h, special_flags=pygame.BLEND_RGB_ADD)
         
-        pygame.draw.rect(self.screen, (0, int(150 + 105 * abs(math.sin(pygame.time.get_ticks()/300))), 0), self.goal_rect)
+        goal_pulse = PULSE_LUT[int(ticks * GOAL_PULSE_SCALE) & (PULSE_LUT_SIZE - 1)]
+        goal_add = (0, int(105 * goal_pulse), 0)
+        for g in self._goal_glow: self.screen.fill(goal_add, g, special_flags=pygame.BLEND_RGB_ADD)
         
-        for p in self.particles: p.draw(self.screen)
-        if not self.death_animation: self.space.debug_draw(self.draw_options)
+        self.particles.draw(self.screen)
+        if not self.death_animation:
+            prev = self._ball_prev
+            drawn = (prev + (self._ball_pos - prev) * self.render_alpha).astype(np.int32) - BALL_RADIUS
+            sprite = self._ball_sprite
+            self.screen.blits([(sprite, pos) for pos in drawn.tolist()], doreturn=False)
         
         # HUD
         if self.current_level_index >= len(self.levels_data):
             self.state = "STATS"
             return
-        if self.current_level_index != -1:
-            lvl_data = self.levels_data[self.current_level_index]
-            name = lvl_data['name']
-            lid = lvl_data['level_id']
-        else:
-            name = "Custom Level"
-            lid = "?"
-            
-        ui_text = f"Level {lid}: {name} | Time: {self.level_time//FPS}s | Lives: {self.lives}"
-        self.screen.blit(self.font.render(ui_text, True, (255, 255, 255)), (20, 20))
+        # Only re-render the line when the time or lives shown change
+        hud_key = (self.level_time//FPS, self.lives)
+        if hud_key != self._hud_key:
+            self._hud_key = hud_key
+            self._hud_surf.fill((0, 0, 0, 0))
+            self.hud_font.render_to(self._hud_surf, (0, self.hud_font.get_sized_ascender()),
+                                    f"{self._level_label} | Time: {hud_key[0]}s | Lives: {hud_key[1]}", (255, 255, 255))
+        self.screen.blit(self._hud_surf, (20, 20))
         
         # Draw Touch Controls
         self.touch_ui.draw(self.screen, self.font)
 
         # Pause/Death Overlay
         if self.death_animation:
-            txt = "GAME OVER" if self.lives <= 0 else f"RESPAWNING... ({self.lives})"
-            color = (255, 50, 50) if self.lives <= 0 else (255, 150, 50)
-            surf = self.big_font.render(txt, True, color)
-            self.screen.blit(surf, surf.get_rect(center=(WIDTH//2, HEIGHT//2)))
+            # The text only depends on lives left
+            if self.lives != self._death_key:
+                self._death_key = self.lives
+                txt = "GAME OVER" if self.lives <= 0 else f"RESPAWNING... ({self.lives})"
+                color = (255, 50, 50) if self.lives <= 0 else (255, 150, 50)
+                surf = self.big_font.render(txt, True, color).convert_alpha()
+                self._death_surf = (surf, surf.get_rect(center=(WIDTH//2, HEIGHT//2)))
+            self.screen.blit(*self._death_surf)
 
         if self.paused:
-            overlay = pygame.Surface((WIDTH, HEIGHT))
-            overlay.set_alpha(128)
-            overlay.fill((0, 0, 0))
-            self.screen.blit(overlay, (0, 0))
-            self.screen.blit(self.big_font.render("PAUSED", True, (255,255,255)), (WIDTH//2 - 60, 120))
+            self.screen.blit(self._pause_overlay, (0, 0))
+            self.screen.blit(self._paused_surf, (WIDTH//2 - 60, 120))
             for b in self.pause_menu_buttons: b.draw(self.screen, self.font)
 
     # --- State Management ---
-    def handle_menu_input(self):
-        for event in pygame.event.get():
+    def handle_menu_input(self, events):
+        for event in events:
             if event.type == pygame.QUIT: self.running = False
             for btn in self.main_menu_buttons:
                 if btn.handle_event(event):
@@ -607,10 +916,10 @@ class PhysicsGame:
                     elif btn.text == "Statistics": self.state = "STATS"
                     elif btn.text == "Quit": self.running = False
 
-    def handle_level_select_input(self):
-        for event in pygame.event.get():
+    def handle_level_select_input(self, events):
+        for event in events:
             if event.type == pygame.QUIT: self.running = False
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE: self.state = "MAIN_MENU"
+            if event.type == pygame.KEYDOWN and event.key == K_ESCAPE: self.state = "MAIN_MENU"
             if event.type == pygame.MOUSEBUTTONDOWN:
                 mp = pygame.mouse.get_pos()
                 for i in range(len(self.levels_data)):
@@ -624,66 +933,141 @@ class PhysicsGame:
                                 if btn.text == "Main Menu":
                                     self.state = "MAIN_MENU"
 
-    def draw_main_menu(self):
-        self.screen.fill((20, 20, 30))
+    def cached_menu_bg(self, name, key, render):
+        """Returns the static part of a menu screen, re-rendered only when key changes"""
+        cached = self._menu_bg_cache.get(name)
+        if cached is None or cached[0] != key:
+            surf = pygame.Surface((WIDTH, HEIGHT)).convert()
+            render(surf)
+            cached = self._menu_bg_cache[name] = (key, surf)
+        return cached[1]
+
+    def draw_highlighted(self, buttons):
+        """Buttons are baked into menu backgrounds un-highlighted; redraw the ones that aren't"""
+        for b in buttons:
+            if b.is_hovered or b.is_pressed: b.draw(self.screen, self.font)
+
+    def render_main_menu(self, surf):
+        surf.fill((20, 20, 30))
         t = self.title_font.render("GRAVITY PUZZLE", True, (100, 200, 255))
-        self.screen.blit(t, t.get_rect(center=(WIDTH//2, 100)))
-        for b in self.main_menu_buttons: b.draw(self.screen, self.font)
+        surf.blit(t, t.get_rect(center=(WIDTH//2, 100)))
+        for b in self.main_menu_buttons: b.draw(surf, self.font, highlighted=False)
 
-    def draw_level_select(self):
-        self.screen.fill((20, 20, 30))
-        self.screen.blit(self.big_font.render("SELECT LEVEL", True, (255,255,255)), (WIDTH//2-100, 50))
+    def draw_main_menu(self):
+        self.screen.blit(self.cached_menu_bg("main", None, self.render_main_menu), (0, 0))
+        self.draw_highlighted(self.main_menu_buttons)
+
+    def render_level_select(self, surf):
+        surf.fill((20, 20, 30))
+        surf.blit(self.big_font.render("SELECT LEVEL", True, (255,255,255)), (WIDTH//2-100, 50))
         for i, lvl in enumerate(self.levels_data):
             row, col = i // 4, i % 4
             x, y = 100 + col * 150, 150 + row * 100
             unlocked = i < self.save_data["unlocked_levels"]
             colr = (50, 200, 50) if unlocked else (50, 50, 50)
-            pygame.draw.rect(self.screen, colr, (x, y, 120, 80), border_radius=10)
+            pygame.draw.rect(surf, colr, (x, y, 120, 80), border_radius=10)
             if unlocked:
-                self.screen.blit(self.font.render(str(lvl['level_id']), True, (255,255,255)), (x+10, y+10))
+                surf.blit(self.font.render(str(lvl['level_id']), True, (255,255,255)), (x+10, y+10))
 
         for btn in self.main_menu_button:
-            btn.draw(self.screen, self.font)
+            btn.draw(surf, self.font, highlighted=False)
 
-    def draw_stats(self):
-        self.screen.fill((20, 20, 30))
+    def draw_level_select(self):
+        key = self.save_data["unlocked_levels"]
+        self.screen.blit(self.cached_menu_bg("level_select", key, self.render_level_select), (0, 0))
+        self.draw_highlighted(self.main_menu_button)
+
+    def render_stats(self, surf):
+        surf.fill((20, 20, 30))
         # Simple stats render
-        self.screen.blit(self.big_font.render("STATS", True, (255,255,255)), (WIDTH//2-50, 50))
+        surf.blit(self.big_font.render("STATS", True, (255,255,255)), (WIDTH//2-50, 50))
         lines = [f"Deaths: {self.save_data['total_deaths']}", f"Unlocked: {self.save_data['unlocked_levels']}"]
         for i, l in enumerate(lines):
-            self.screen.blit(self.font.render(l, True, (255,255,255)), (WIDTH//2-50, 150+i*40))
-        self.screen.blit(self.font.render("ESC to return", True, (150,150,150)), (WIDTH//2-50, HEIGHT-50))
+            surf.blit(self.font.render(l, True, (255,255,255)), (WIDTH//2-50, 150+i*40))
+        surf.blit(self.font.render("ESC to return", True, (150,150,150)), (WIDTH//2-50, HEIGHT-50))
         for btn in self.main_menu_button:
-            btn.draw(self.screen, self.font)
-    def handle_stats_input(self):
-        for event in pygame.event.get():
+            btn.draw(surf, self.font, highlighted=False)
+
+    def draw_stats(self):
+        key = (self.save_data["total_deaths"], self.save_data["unlocked_levels"])
+        self.screen.blit(self.cached_menu_bg("stats", key, self.render_stats), (0, 0))
+        self.draw_highlighted(self.main_menu_button)
+
+    def handle_stats_input(self, events):
+        for event in events:
             if event.type == pygame.QUIT: self.running = False
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE: self.state = "MAIN_MENU"
+            if event.type == pygame.KEYDOWN and event.key == K_ESCAPE: self.state = "MAIN_MENU"
             for btn in self.main_menu_button:
                             if btn.handle_event(event):
                                 if btn.text == "Main Menu":
                                     self.state = "MAIN_MENU"
+    def wait_events(self):
+        """Blocks until input arrives (or MENU_IDLE_MS passes) and returns everything queued"""
+        event = pygame.event.wait(MENU_IDLE_MS)
+        if event.type == pygame.NOEVENT: return []
+        return [event] + pygame.event.get(ALLOWED_EVENTS)
+
+    def menu_dirty_rects(self):
+        """Areas of a static menu screen that can change between frames (button hover)"""
+        if self.state == "MAIN_MENU": return [b.rect for b in self.main_menu_buttons]
+        if self.state in ("LEVEL_SELECT", "STATS"): return [b.rect for b in self.main_menu_button]
+        return None
+
     def run(self):
+        prev = time.perf_counter()
+        acc = 0.0
+        last_drawn = None
         while self.running:
-            if self.state == "MAIN_MENU":
-                self.handle_menu_input()
-                self.draw_main_menu()
-            elif self.state == "LEVEL_SELECT":
-                self.handle_level_select_input()
-                self.draw_level_select()
-            elif self.state == "PLAYING":
+            now = time.perf_counter()
+            frame_time, prev = now - prev, now
+
+            if not pygame.display.get_active():
+                # Minimized: nothing is visible, so only keep the event queue drained.
+                # The level clock is frozen until the window comes back.
+                for event in pygame.event.get(ALLOWED_EVENTS):
+                    if event.type == pygame.QUIT: self.running = False
+                    elif event.type == pygame.MOUSEBUTTONUP: self.touch_ui.handle_event(event) # Don't leave a touch button held
+                last_drawn = None
+                self.clock.tick(INACTIVE_FPS)
+                prev = time.perf_counter() # Hidden time is never simulated, even after restore
+                continue
+
+            state = self.state
+            dirty_rects = self.menu_dirty_rects()
+            if state == "PLAYING":
                 self.handle_playing_input()
-                self.update()
+                # Run as many fixed ticks as real time has elapsed, then render once.
+                # Paused time isn't accumulated, so the leftover (and alpha) holds still.
+                if not self.paused: acc = min(acc + frame_time, MAX_FRAME_TIME)
+                while acc >= PHYSICS_DT and self.state == "PLAYING":
+                    self.update_physics(PHYSICS_DT)
+                    acc -= PHYSICS_DT
+                self.render_alpha = acc / PHYSICS_DT
                 self.draw_playing()
-            elif self.state == "EDITOR":
-                self.handle_editor_input()
-                self.draw_editor()
-            elif self.state == "STATS":
-                self.handle_stats_input()
-                self.draw_stats()
-            
-            pygame.display.flip()
-            self.clock.tick(FPS)
+            else:
+                # Menus only change in response to input, so sleep until some arrives
+                acc = 0.0
+                events = self.wait_events()
+                if not events and state == last_drawn:
+                    self.clock.tick(MENU_FPS)
+                    continue
+                handle, draw = self._menu_states[state]
+                handle(events)
+                draw()
+
+            # Anything held back by the save debounce is written when leaving for the menu
+            if self.state == "MAIN_MENU" and state != "MAIN_MENU": self.save_game(force=True)
+
+            # A menu that was already on screen last frame only needs its buttons pushed
+            if dirty_rects and state == last_drawn:
+                pygame.display.update(dirty_rects)
+            else:
+                pygame.display.flip()
+            last_drawn = state
+            self.clock.tick(FPS if state == "PLAYING" else MENU_FPS)
+            # Time spent waiting in a menu isn't play time, so a level starts on a fresh clock
+            if state != "PLAYING": prev = time.perf_counter()
+        self.save_game(force=True)
         pygame.quit()
 
 if __name__ == "__main__":